@@ -63,6 +63,13 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+# Traces with at least this many points are drawn with WebGL instead of SVG
+SCATTERGL_MIN_ROWS = 1000
+
+# Upper bound on candles sent to the browser for the price & volume chart
+MAX_CHART_POINTS = 2000
+
+
 # Initialize data loader as singleton
 @st.cache_resource
 def initialize_data_loader():
@@ -70,6 +77,125 @@ def initialize_data_loader():
     return DataLoader()
 
 
+def _current_hour():
+    """Return the current local hour as a cache stamp, e.g. '2024-05-01T14'"""
+    return datetime.now().strftime('%Y-%m-%dT%H')
+
+
+# Persisted caches ignore ttl; entries record the hour they were fetched instead
+@st.cache_data(persist="disk", max_entries=500, show_spinner=False)
+def _persisted_company_info(symbol):
+    """Fetch company information and persist it to disk across server restarts"""
+    company_info = initialize_data_loader().get_company_info(symbol)
+
+    if company_info is None:
+        # Raising keeps transient failures out of the persisted cache
+        raise LookupError(f"No company info for {symbol}")
+
+    return {'hour': _current_hour(), 'info': company_info}
+
+
+def _cached_company_info(symbol):
+    """Fetch company information from the persisted cache, refreshing it hourly"""
+    try:
+        entry = _persisted_company_info(symbol)
+
+        if entry.get('hour') != _current_hour():
+            # Keyed on the symbol alone, so there is one file per symbol on disk;
+            # clear() deletes them all and symbols refetch lazily for the new hour
+            _persisted_company_info.clear()
+            entry = _persisted_company_info(symbol)
+
+        return entry['info']
+    except LookupError:
+        return None
+
+
+def _news_md(symbol, count):
+    """Render recent news for a symbol as a single markdown block"""
+    news_items = initialize_data_loader().get_stock_news(symbol, count)
+
+    return "\n\n---\n\n".join(
+        f"#### 📰 {news['title']}\n\n"
+        f"**Source:** {news['source']} · **Published:** {news['published_at']:%Y-%m-%d %H:%M}\n\n"
+        f"**Summary:** {news['summary']}\n\n"
+        f"**URL:** {news['url']}"
+        for news in news_items
+    )
+
+
+def _downsample_ohlcv(data, max_points=MAX_CHART_POINTS):
+    """Aggregate consecutive OHLCV bars so at most max_points candles are plotted"""
+    if len(data) <= max_points:
+        return data
+
+    step = -(-len(data) // max_points)  # ceiling division
+    grouped = data.groupby(np.arange(len(data)) // step)
+
+    return pd.DataFrame({
+        'Open': grouped['Open'].first(),
+        'High': grouped['High'].max(),
+        'Low': grouped['Low'].min(),
+        'Close': grouped['Close'].last(),
+        'Volume': grouped['Volume'].sum()
+    }).set_axis(data.index[::step])
+
+
+def _index_performance_traces(indices):
+    """Build one line trace per index, drawing long histories with WebGL"""
+    traces = []
+
+    for name, data in indices.items():
+        if 'data' not in data or data['data'] is None:
+            continue
+
+        trace_cls = go.Scattergl if len(data['data']) >= SCATTERGL_MIN_ROWS else go.Scatter
+        traces.append(trace_cls(
+            x=data['data'].index,
+            y=data['data']['Close'],
+            mode='lines',
+            name=name,
+            line=dict(width=2),
+            hovertemplate=f"<b>{name}</b><br>" +
+                          "Date: %{x}<br>" +
+                          "Value: %{y:.2f}<extra></extra>"
+        ))
+
+    return traces
+
+
+def _company_md(info):
+    """
+    Build the two company overview markdown blocks
+
+    Args:
+        info (dict): Company information from DataLoader.get_company_info
+
+    Returns:
+        tuple: (profile markdown, valuation markdown)
+    """
+    def ratio(label, key):
+        return f"**{label}:** {info[key]:.2f}" if info[key] else f"**{label}:** N/A"
+
+    info_md = "\n\n".join([
+        f"**Sector:** {info['sector']}",
+        f"**Industry:** {info['industry']}",
+        f"**Country:** {info['country']}",
+        f"**Market Cap:** {DataLoader.format_currency(info['market_cap'])}",
+        f"**Enterprise Value:** {DataLoader.format_currency(info['enterprise_value'])}"
+    ])
+
+    valuation_md = "\n\n".join([
+        ratio("P/E Ratio", 'pe_ratio'),
+        ratio("Forward P/E", 'forward_pe'),
+        ratio("PEG Ratio", 'peg_ratio'),
+        ratio("Price-to-Book", 'price_to_book'),
+        ratio("Beta", 'beta')
+    ])
+
+    return info_md, valuation_md
+
+
 def main():
     """Main application function"""
 
@@ -79,17 +205,7 @@ def main():
     st.sidebar.title("🚀 Navigation")
     st.sidebar.markdown("---")
 
-    page = st.sidebar.selectbox(
-        "Choose a page",
-        [
-            "🌍 Market Overview",
-            "📊 Technical Analysis",
-            "🤖 ML Predictions",
-            "💼 Portfolio Optimization",
-            "😊 Sentiment Analysis",
-            "⚙️ Settings"
-        ]
-    )
+    page = st.sidebar.selectbox("Choose a page", list(_PAGES))
 
     # Add cache status info
     st.sidebar.markdown("### 💾 Cache Status")
@@ -99,18 +215,7 @@ def main():
         st.rerun()
 
     # Route to appropriate page - data_loader is accessed within each function
-    if page == "🌍 Market Overview":
-        show_market_overview()
-    elif page == "📊 Technical Analysis":
-        show_technical_analysis()
-    elif page == "🤖 ML Predictions":
-        show_ml_predictions()
-    elif page == "💼 Portfolio Optimization":
-        show_portfolio_optimization()
-    elif page == "😊 Sentiment Analysis":
-        show_sentiment_analysis()
-    elif page == "⚙️ Settings":
-        show_settings()
+    _PAGES[page]()
 
     # Footer
     st.markdown("---")
@@ -149,26 +254,13 @@ def show_market_overview():
         st.subheader("📊 Market Performance (5-Day)")
 
         # Create multi-line chart with all indices
-        fig = go.Figure()
-
-        for name, data in indices.items():
-            if 'data' in data and data['data'] is not None:
-                fig.add_trace(go.Scatter(
-                    x=data['data'].index,
-                    y=data['data']['Close'],
-                    mode='lines',
-                    name=name,
-                    line=dict(width=2),
-                    hovertemplate=f"<b>{name}</b><br>" +
-                                  "Date: %{x}<br>" +
-                                  "Value: %{y:.2f}<extra></extra>"
-                ))
+        fig = go.Figure(_index_performance_traces(indices))
 
         fig.update_layout(
             title="Market Indices Performance",
             xaxis_title="Date",
             yaxis_title="Index Value",
-            hovermode='x unified',
+            hovermode='closest',  # unified hover scans every point of every index
             showlegend=True,
             height=500
         )
@@ -179,6 +271,12 @@ def show_market_overview():
         st.error("Could not load market indices data. Please check your internet connection.")
 
     # Individual stock analysis
+    _stock_analysis_fragment()
+
+
+@st.fragment
+def _stock_analysis_fragment():
+    """Stock picker and analysis, rerun on its own when its widgets change"""
     st.subheader("🔍 Individual Stock Analysis")
 
     col1, col2, col3 = st.columns(3)
@@ -198,72 +296,114 @@ def show_market_overview():
         )
 
     with col3:
-        if st.button("🚀 Analyze Stock"):
-            analyze_individual_stock(selected_stock, time_period)
+        analyze_clicked = st.button("🚀 Analyze Stock")
 
+    if analyze_clicked:
+        analyze_individual_stock(selected_stock, time_period)
 
-def analyze_individual_stock(symbol, period):
-    """Analyze individual stock with real data"""
 
-    # Get data loader instance
+@st.cache_data(ttl=300, show_spinner=False)  # Same lifetime as the stock data
+def _compute_stock_view(symbol, period):
+    """
+    Fetch and precompute everything the stock analysis view displays
+
+    Args:
+        symbol (str): Stock symbol
+        period (str): Time period
+
+    Returns:
+        dict: Precomputed display values, or None if data could not be loaded
+    """
     data_loader = initialize_data_loader()
 
+    # Get stock data and company info
+    stock_data = data_loader.get_stock_data(symbol, period)
+    company_info = _cached_company_info(symbol)
+
+    if stock_data is None or company_info is None:
+        return None
+
+    info_md, valuation_md = _company_md(company_info)
+
+    financial_metrics = pd.DataFrame({
+        'Metric': ["Revenue", "EPS", "Profit Margin", "Operating Margin",
+                   "ROE", "ROA", "Dividend Yield", "Payout Ratio"],
+        'Value': [
+            data_loader.format_currency(company_info['revenue']),
+            f"${company_info['eps']:.2f}" if company_info['eps'] else "N/A",
+            data_loader.format_percentage(company_info['profit_margin']),
+            data_loader.format_percentage(company_info['operating_margin']),
+            data_loader.format_percentage(company_info['return_on_equity']),
+            data_loader.format_percentage(company_info['return_on_assets']),
+            data_loader.format_percentage(company_info['dividend_yield']),
+            data_loader.format_percentage(company_info['payout_ratio'])
+        ]
+    }).set_index('Metric')
+
+    # Long histories are bucketed so the browser only draws what fits on screen,
+    # and float32 halves the serialized payload without visible precision loss
+    chart_data = _downsample_ohlcv(stock_data)[['Open', 'High', 'Low', 'Close', 'Volume']].astype(np.float32)
+
+    # Serialize the shared date axis once and reuse it for both subplots
+    dates = chart_data.index.tz_localize(None) if chart_data.index.tz is not None else chart_data.index
+    x_ax = dates.strftime('%Y-%m-%d %H:%M:%S').tolist()
+
+    # Performance metrics
+    close = stock_data['Close'].to_numpy(dtype=np.float64, copy=False)
+    returns = np.diff(close) / close[:-1]
+    mean_return, std_return = returns.mean(), returns.std(ddof=1)
+
+    performance = {
+        'total_return': (close[-1] / close[0] - 1.0) * 100,
+        'volatility': std_return * np.sqrt(252) * 100,
+        'sharpe_ratio': (mean_return * 252) / (std_return * np.sqrt(252)) if std_return else np.nan,
+        'max_drawdown': (close / np.maximum.accumulate(close) - 1.0).min() * 100
+    }
+
+    return {
+        'name': company_info['name'],
+        'info_md': info_md,
+        'valuation_md': valuation_md,
+        'financial_metrics': financial_metrics,
+        'chart_data': chart_data,
+        'x_ax': x_ax,
+        'performance': performance,
+        'quality_report': data_loader.get_data_quality_report(stock_data)
+    }
+
+
+def analyze_individual_stock(symbol, period):
+    """Analyze individual stock with real data"""
+
     with st.spinner(f"Loading data for {symbol}..."):
-        # Get stock data and company info
-        stock_data = data_loader.get_stock_data(symbol, period)
-        company_info = data_loader.get_company_info(symbol)
+        view = _compute_stock_view(symbol, period)
 
-        if stock_data is not None and company_info is not None:
+        if view is not None:
             # Company information section
-            st.markdown(f"### {company_info['name']} ({symbol})")
+            st.markdown(f"### {view['name']} ({symbol})")
 
             # Basic company info
             col1, col2 = st.columns(2)
 
             with col1:
-                st.markdown(f"**Sector:** {company_info['sector']}")
-                st.markdown(f"**Industry:** {company_info['industry']}")
-                st.markdown(f"**Country:** {company_info['country']}")
-                st.markdown(f"**Market Cap:** {data_loader.format_currency(company_info['market_cap'])}")
-                st.markdown(f"**Enterprise Value:** {data_loader.format_currency(company_info['enterprise_value'])}")
+                st.markdown(view['info_md'])
 
             with col2:
-                st.markdown(f"**P/E Ratio:** {company_info['pe_ratio']:.2f}" if company_info[
-                    'pe_ratio'] else "**P/E Ratio:** N/A")
-                st.markdown(f"**Forward P/E:** {company_info['forward_pe']:.2f}" if company_info[
-                    'forward_pe'] else "**Forward P/E:** N/A")
-                st.markdown(f"**PEG Ratio:** {company_info['peg_ratio']:.2f}" if company_info[
-                    'peg_ratio'] else "**PEG Ratio:** N/A")
-                st.markdown(f"**Price-to-Book:** {company_info['price_to_book']:.2f}" if company_info[
-                    'price_to_book'] else "**Price-to-Book:** N/A")
-                st.markdown(f"**Beta:** {company_info['beta']:.2f}" if company_info['beta'] else "**Beta:** N/A")
+                st.markdown(view['valuation_md'])
 
             # Financial metrics
             st.subheader("💰 Financial Metrics")
 
-            col1, col2, col3, col4 = st.columns(4)
-
-            with col1:
-                st.metric("Revenue", data_loader.format_currency(company_info['revenue']))
-                st.metric("EPS", f"${company_info['eps']:.2f}" if company_info['eps'] else "N/A")
-
-            with col2:
-                st.metric("Profit Margin", data_loader.format_percentage(company_info['profit_margin']))
-                st.metric("Operating Margin", data_loader.format_percentage(company_info['operating_margin']))
-
-            with col3:
-                st.metric("ROE", data_loader.format_percentage(company_info['return_on_equity']))
-                st.metric("ROA", data_loader.format_percentage(company_info['return_on_assets']))
-
-            with col4:
-                st.metric("Dividend Yield", data_loader.format_percentage(company_info['dividend_yield']))
-                st.metric("Payout Ratio", data_loader.format_percentage(company_info['payout_ratio']))
+            st.dataframe(view['financial_metrics'], use_container_width=True)
 
             # Price chart with volume
             st.subheader("📊 Stock Price & Volume")
 
             from plotly.subplots import make_subplots
 
+            chart_data = view['chart_data']
+            x_ax = view['x_ax']
+
             fig = make_subplots(
                 rows=2, cols=1,
                 shared_xaxes=True,
@@ -275,11 +415,11 @@ def analyze_individual_stock(symbol, period):
             # Candlestick chart
             fig.add_trace(
                 go.Candlestick(
-                    x=stock_data.index,
-                    open=stock_data['Open'],
-                    high=stock_data['High'],
-                    low=stock_data['Low'],
-                    close=stock_data['Close'],
+                    x=x_ax,
+                    open=chart_data['Open'],
+                    high=chart_data['High'],
+                    low=chart_data['Low'],
+                    close=chart_data['Close'],
                     name='Price'
                 ),
                 row=1, col=1
@@ -288,8 +428,8 @@ def analyze_individual_stock(symbol, period):
             # Volume chart
             fig.add_trace(
                 go.Bar(
-                    x=stock_data.index,
-                    y=stock_data['Volume'],
+                    x=x_ax,
+                    y=chart_data['Volume'],
                     name='Volume',
                     marker_color='rgba(158,202,225,0.8)'
                 ),
@@ -299,6 +439,7 @@ def analyze_individual_stock(symbol, period):
             fig.update_layout(
                 title=f"{symbol} Stock Analysis - {period.upper()}",
                 xaxis_rangeslider_visible=False,
+                hovermode='x unified',
                 height=600
             )
 
@@ -307,41 +448,29 @@ def analyze_individual_stock(symbol, period):
             # Performance metrics
             st.subheader("📈 Performance Metrics")
 
-            returns = stock_data['Close'].pct_change().dropna()
+            performance = view['performance']
 
             col1, col2, col3, col4 = st.columns(4)
 
             with col1:
-                total_return = ((stock_data['Close'].iloc[-1] / stock_data['Close'].iloc[0]) - 1) * 100
-                st.metric("Total Return", f"{total_return:.2f}%")
+                st.metric("Total Return", f"{performance['total_return']:.2f}%")
 
             with col2:
-                volatility = returns.std() * np.sqrt(252) * 100
-                st.metric("Annualized Volatility", f"{volatility:.2f}%")
+                st.metric("Annualized Volatility", f"{performance['volatility']:.2f}%")
 
             with col3:
-                sharpe_ratio = (returns.mean() * 252) / (returns.std() * np.sqrt(252))
-                st.metric("Sharpe Ratio", f"{sharpe_ratio:.2f}")
+                st.metric("Sharpe Ratio", f"{performance['sharpe_ratio']:.2f}")
 
             with col4:
-                max_drawdown = (stock_data['Close'] / stock_data['Close'].cummax() - 1).min() * 100
-                st.metric("Max Drawdown", f"{max_drawdown:.2f}%")
+                st.metric("Max Drawdown", f"{performance['max_drawdown']:.2f}%")
 
             # Data quality report
             with st.expander("📋 Data Quality Report"):
-                quality_report = data_loader.get_data_quality_report(stock_data)
-                st.json(quality_report)
+                st.json(view['quality_report'])
 
             # Recent news (placeholder)
-            st.subheader("📰 Recent News")
-            news_items = data_loader.get_stock_news(symbol, 5)
-
-            for news in news_items:
-                with st.expander(f"📰 {news['title']}"):
-                    st.write(f"**Source:** {news['source']}")
-                    st.write(f"**Published:** {news['published_at'].strftime('%Y-%m-%d %H:%M')}")
-                    st.write(f"**Summary:** {news['summary']}")
-                    st.write(f"**URL:** {news['url']}")
+            with st.expander("📰 Recent News", expanded=True):
+                st.markdown(_news_md(symbol, 5))
 
         else:
             st.error(f"Could not load data for {symbol}. Please try again or select a different stock.")
@@ -427,5 +556,16 @@ def show_settings():
     st.info(f"API will retry {max_retries} times with {retry_delay}s delay")
 
 
+# Page label -> renderer; also the single source of truth for the sidebar options
+_PAGES = {
+    "🌍 Market Overview": show_market_overview,
+    "📊 Technical Analysis": show_technical_analysis,
+    "🤖 ML Predictions": show_ml_predictions,
+    "💼 Portfolio Optimization": show_portfolio_optimization,
+    "😊 Sentiment Analysis": show_sentiment_analysis,
+    "⚙️ Settings": show_settings
+}
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
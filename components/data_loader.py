@@ -1,8 +1,13 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import yfinance as yf
+import bottleneck as bn
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from functools import lru_cache
+import random
 import requests
 import time
 import warnings
@@ -10,19 +15,119 @@ import warnings
 warnings.filterwarnings('ignore')
 
 
+def _script_thread_pool(max_workers):
+    """
+    Create a thread pool whose workers share the current Streamlit script context
+
+    Without the context, st.warning/st.error calls made from worker threads
+    are silently dropped instead of being rendered in the app.
+
+    Args:
+        max_workers (int): Maximum number of worker threads
+
+    Returns:
+        ThreadPoolExecutor: Executor to be used as a context manager
+    """
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx())
+    )
+
+
 class DataLoader:
     """
     Professional data loading class for financial data
     Handles API connections, caching, and error management
     """
 
+    # Major market indices shown on the overview page (display name -> symbol)
+    _INDEX_SYMBOLS = {
+        'S&P 500': '^GSPC',
+        'NASDAQ': '^IXIC',
+        'DOW JONES': '^DJI',
+        'Russell 2000': '^RUT',
+        'VIX': '^VIX'
+    }
+
+    # (key_metrics key, yfinance info key, default) extracted by get_company_info
+    _INFO_FIELDS = [
+        ('name', 'longName', 'N/A'),
+        ('sector', 'sector', 'N/A'),
+        ('industry', 'industry', 'N/A'),
+        ('country', 'country', 'N/A'),
+        ('website', 'website', 'N/A'),
+
+        # Financial metrics
+        ('market_cap', 'marketCap', 0),
+        ('enterprise_value', 'enterpriseValue', 0),
+        ('pe_ratio', 'trailingPE', 0),
+        ('forward_pe', 'forwardPE', 0),
+        ('peg_ratio', 'pegRatio', 0),
+        ('price_to_book', 'priceToBook', 0),
+        ('price_to_sales', 'priceToSalesTrailing12Months', 0),
+
+        # Dividends
+        ('dividend_yield', 'dividendYield', 0),
+        ('dividend_rate', 'dividendRate', 0),
+        ('payout_ratio', 'payoutRatio', 0),
+
+        # Performance metrics
+        ('beta', 'beta', 0),
+        ('eps', 'trailingEps', 0),
+        ('revenue', 'totalRevenue', 0),
+        ('profit_margin', 'profitMargins', 0),
+        ('operating_margin', 'operatingMargins', 0),
+        ('return_on_equity', 'returnOnEquity', 0),
+        ('return_on_assets', 'returnOnAssets', 0),
+
+        # Trading metrics
+        ('volume', 'volume', 0),
+        ('avg_volume', 'averageVolume', 0),
+        ('52_week_high', 'fiftyTwoWeekHigh', 0),
+        ('52_week_low', 'fiftyTwoWeekLow', 0),
+
+        # Analyst recommendations
+        ('target_price', 'targetMeanPrice', 0),
+        ('recommendation', 'recommendationKey', 'N/A'),
+        ('num_analyst_opinions', 'numberOfAnalystOpinions', 0),
+
+        # Business description
+        ('business_summary', 'longBusinessSummary', 'N/A')
+    ]
+
+    # Placeholder news items (age, title, summary, source, url) used by get_stock_news
+    _NEWS_TEMPLATE = [
+        (timedelta(hours=2),
+         "{symbol} Reports Strong Quarterly Earnings",
+         "Company {symbol} exceeded analyst expectations with revenue growth.",
+         "Financial Times",
+         "https://example.com/news1"),
+        (timedelta(hours=8),
+         "{symbol} Announces New Product Launch",
+         "{symbol} unveiled its latest innovation at the tech conference.",
+         "Reuters",
+         "https://example.com/news2"),
+        (timedelta(days=1),
+         "Analyst Upgrades {symbol} Rating",
+         "Wall Street analyst raises price target for {symbol}.",
+         "Bloomberg",
+         "https://example.com/news3")
+    ]
+
+    # Columns kept at full precision when cleaned data is downcast to float32
+    _FLOAT64_COLUMNS = ['Close', 'Returns', 'Log_Returns']
+
     def __init__(self):
         self.cache_duration = 300  # 5 minutes cache
         self.max_retries = 3
         self.retry_delay = 1  # seconds
+        self.max_retry_delay = 8  # seconds, caps the exponential backoff
 
+    # Cached methods name the instance `_self` so Streamlit skips hashing it and
+    # keys each cache on the call arguments only
     @st.cache_data(ttl=300)
-    def get_stock_data(self, symbol, period="1y", interval="1d"):
+    def get_stock_data(_self, symbol, period="1y", interval="1d"):
         """
         Fetch stock data from Yahoo Finance with error handling
 
@@ -35,7 +140,7 @@ class DataLoader:
             pd.DataFrame: Stock data with OHLCV columns, or None if failed
         """
 
-        for attempt in range(self.max_retries):
+        for attempt in range(_self.max_retries):
             try:
                 # Create ticker object
                 ticker = yf.Ticker(symbol)
@@ -48,20 +153,32 @@ class DataLoader:
                     return None
 
                 # Clean and enhance the data
-                data = self._clean_stock_data(data, symbol)
+                data = _self._clean_stock_data(data, symbol)
 
                 return data
 
             except Exception as e:
-                if attempt < self.max_retries - 1:
+                if attempt < _self.max_retries - 1:
                     st.warning(f"Attempt {attempt + 1} failed for {symbol}, retrying...")
-                    time.sleep(self.retry_delay * (attempt + 1))  # Exponential backoff
+                    _self._backoff(attempt)
                 else:
-                    st.error(f"Failed to fetch data for {symbol} after {self.max_retries} attempts: {str(e)}")
+                    st.error(f"Failed to fetch data for {symbol} after {_self.max_retries} attempts: {str(e)}")
                     return None
 
         return None
 
+    def _backoff(self, attempt):
+        """
+        Sleep before the next retry
+
+        Capped exponential backoff with jitter so concurrent retries don't align
+
+        Args:
+            attempt (int): Zero-based index of the attempt that just failed
+        """
+        delay = min(self.retry_delay * 2 ** attempt, self.max_retry_delay)
+        time.sleep(delay + random.uniform(0, 0.25))
+
     def _clean_stock_data(self, data, symbol):
         """
         Clean and enhance stock data with additional features
@@ -78,34 +195,85 @@ class DataLoader:
         data = data.dropna(how='all')
 
         # Forward fill missing values (common for weekends/holidays)
-        data = data.fillna(method='ffill')
+        data = data.ffill()
+
+        # Add symbol column as a categorical: one stored string plus int8 codes
+        # instead of a per-row object column in the cached frame
+        data['Symbol'] = pd.Categorical([symbol] * len(data))
+
+        # Calculate additional features from the raw arrays in one pass
+        features = self._compute_features(
+            data['Close'].to_numpy(dtype=np.float64),
+            data['High'].to_numpy(dtype=np.float64),
+            data['Low'].to_numpy(dtype=np.float64),
+            data['Volume'].to_numpy(dtype=np.float64)
+        )
+        data = data.assign(**features)
+
+        # Downcast to halve memory; Close and the return series stay float64 because
+        # compounded metrics (total return, drawdown, Sharpe) are computed from them
+        float_cols = data.select_dtypes('float64').columns.difference(self._FLOAT64_COLUMNS)
+        data[float_cols] = data[float_cols].astype(np.float32)
+        # Volume gets int32 unless it needs int64; downcast='integer' alone picks int8/int16
+        # for thinly traded symbols, and arithmetic on those wraps around silently
+        volume = pd.to_numeric(data['Volume'], downcast='integer')
+        if volume.dtype.kind == 'i' and volume.dtype.itemsize < 4:
+            volume = volume.astype(np.int32)
+        data['Volume'] = volume
 
-        # Add symbol column
-        data['Symbol'] = symbol
-
-        # Calculate additional features
-        data['Returns'] = data['Close'].pct_change()
-        data['Log_Returns'] = np.log(data['Close'] / data['Close'].shift(1))
-
-        # Volatility (20-day rolling)
-        data['Volatility'] = data['Returns'].rolling(window=20).std()
+        return data
 
-        # Price range (High - Low)
-        data['Price_Range'] = data['High'] - data['Low']
-        data['Price_Range_Pct'] = (data['Price_Range'] / data['Close']) * 100
+    @staticmethod
+    def _compute_features(close, high, low, volume, window=20):
+        """
+        Derive return, range, volume and support/resistance features
 
-        # Volume moving average
-        data['Volume_MA'] = data['Volume'].rolling(window=20).mean()
-        data['Volume_Ratio'] = data['Volume'] / data['Volume_MA']
+        Works on plain ndarrays so each input is read once and no intermediate
+        Series are built. Rolling windows use bottleneck's O(n) moving-window
+        kernels, which match pandas' min_periods=window semantics.
 
-        # Support and resistance levels (basic)
-        data['Support'] = data['Low'].rolling(window=20).min()
-        data['Resistance'] = data['High'].rolling(window=20).max()
+        Args:
+            close, high, low, volume (np.ndarray): float64 OHLCV columns
+            window (int): Rolling window length in bars
 
-        return data
+        Returns:
+            dict: Feature name -> ndarray, in column order
+        """
+        def rolling(move_func, values, **kwargs):
+            # bottleneck rejects windows longer than the array; pandas yields all-NaN
+            if len(values) < window:
+                return np.full_like(values, np.nan)
+            return move_func(values, window=window, **kwargs)
+
+        returns = np.full_like(close, np.nan)
+        log_returns = np.full_like(close, np.nan)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns[1:] = close[1:] / close[:-1] - 1.0
+            # log1p reuses the returns and stays accurate for small moves
+            log_returns[1:] = np.log1p(returns[1:])
+
+            price_range = high - low
+            volume_ma = rolling(bn.move_mean, volume)
+
+            return {
+                'Returns': returns,
+                'Log_Returns': log_returns,
+                # Volatility (20-day rolling)
+                'Volatility': rolling(bn.move_std, returns, ddof=1),
+                # Price range (High - Low)
+                'Price_Range': price_range,
+                'Price_Range_Pct': price_range / close * 100,
+                # Volume moving average
+                'Volume_MA': volume_ma,
+                'Volume_Ratio': volume / volume_ma,
+                # Support and resistance levels (basic)
+                'Support': rolling(bn.move_min, low),
+                'Resistance': rolling(bn.move_max, high)
+            }
 
     @st.cache_data(ttl=300)
-    def get_multiple_stocks(self, symbols, period="1y"):
+    def get_multiple_stocks(_self, symbols, period="1y"):
         """
         Fetch data for multiple stocks efficiently
 
@@ -120,23 +288,35 @@ class DataLoader:
         stock_data = {}
         failed_symbols = []
 
+        if not symbols:
+            return stock_data
+
         # Create progress bar
         progress_bar = st.progress(0)
         status_text = st.empty()
+        status_text.text(f"Loading {len(symbols)} symbols...")
+
+        # Fetches are network-bound, so run them concurrently and report progress
+        # from this thread as each one completes
+        results = {}
 
-        for i, symbol in enumerate(symbols):
-            status_text.text(f"Loading {symbol}...")
+        with _script_thread_pool(min(16, len(symbols))) as executor:
+            futures = {executor.submit(_self.get_stock_data, symbol, period): symbol for symbol in symbols}
 
-            data = self.get_stock_data(symbol, period)
-            if data is not None:
-                stock_data[symbol] = data
+            for completed, future in enumerate(as_completed(futures), start=1):
+                symbol = futures[future]
+                results[symbol] = future.result()
+
+                status_text.text(f"Loaded {symbol}")
+                progress_bar.progress(completed / len(symbols))
+
+        # Keep the caller's symbol order
+        for symbol in symbols:
+            if results[symbol] is not None:
+                stock_data[symbol] = results[symbol]
             else:
                 failed_symbols.append(symbol)
 
-            # Update progress
-            progress_bar.progress((i + 1) / len(symbols))
-            time.sleep(0.1)  # Small delay to show progress
-
         # Clear progress indicators
         progress_bar.empty()
         status_text.empty()
@@ -147,7 +327,7 @@ class DataLoader:
         return stock_data
 
     @st.cache_data(ttl=600)  # Cache for 10 minutes
-    def get_market_indices(self):
+    def get_market_indices(_self):
         """
         Fetch major market indices data
 
@@ -155,53 +335,65 @@ class DataLoader:
             dict: Dictionary with index data and metrics
         """
 
-        indices = {
-            'S&P 500': '^GSPC',
-            'NASDAQ': '^IXIC',
-            'DOW JONES': '^DJI',
-            'Russell 2000': '^RUT',
-            'VIX': '^VIX'
-        }
+        for attempt in range(_self.max_retries):
+            try:
+                # One batched request for every index instead of a round-trip each
+                bulk = yf.download(
+                    list(_self._INDEX_SYMBOLS.values()),
+                    period="5d",
+                    interval="1d",
+                    group_by='ticker',
+                    threads=True,
+                    progress=False
+                )
+
+                # yfinance reports failed downloads as empty/all-NaN frames rather than raising
+                if bulk.dropna(how='all').empty:
+                    raise ValueError("no index data returned")
+
+                break
+
+            except Exception as e:
+                if attempt < _self.max_retries - 1:
+                    st.warning(f"Attempt {attempt + 1} failed for market indices, retrying...")
+                    _self._backoff(attempt)
+                else:
+                    st.error(f"Failed to fetch market indices after {_self.max_retries} attempts: {str(e)}")
+                    return {}
 
         index_data = {}
+        downloaded = set(bulk.columns.get_level_values(0))
 
-        for name, symbol in indices.items():
-            try:
-                data = self.get_stock_data(symbol, period="5d", interval="1d")
-
-                if data is not None and len(data) >= 2:
-                    current_price = data['Close'].iloc[-1]
-                    previous_price = data['Close'].iloc[-2]
-
-                    change = current_price - previous_price
-                    change_pct = (change / previous_price) * 100
-
-                    # Calculate additional metrics
-                    week_high = data['High'].max()
-                    week_low = data['Low'].min()
-                    avg_volume = data['Volume'].mean()
-
-                    index_data[name] = {
-                        'symbol': symbol,
-                        'current': current_price,
-                        'previous': previous_price,
-                        'change': change,
-                        'change_pct': change_pct,
-                        'week_high': week_high,
-                        'week_low': week_low,
-                        'avg_volume': avg_volume,
-                        'data': data
-                    }
-                else:
-                    st.warning(f"Insufficient data for {name}")
+        for name, symbol in _self._INDEX_SYMBOLS.items():
+            # Failed tickers come back as all-NaN columns
+            data = bulk[symbol].dropna(how='all') if symbol in downloaded else None
 
-            except Exception as e:
-                st.error(f"Error fetching {name}: {str(e)}")
+            if data is None or len(data) < 2:
+                st.warning(f"Insufficient data for {name}")
+                continue
+
+            close = data['Close'].to_numpy()
+            current_price, previous_price = close[-1], close[-2]
+
+            change = current_price - previous_price
+            change_pct = (change / previous_price) * 100
+
+            index_data[name] = {
+                'symbol': symbol,
+                'current': current_price,
+                'previous': previous_price,
+                'change': change,
+                'change_pct': change_pct,
+                'week_high': data['High'].to_numpy().max(),
+                'week_low': data['Low'].to_numpy().min(),
+                'avg_volume': data['Volume'].to_numpy().mean(),
+                'data': data
+            }
 
         return index_data
 
     @st.cache_data(ttl=3600)  # Cache for 1 hour
-    def get_company_info(self, symbol):
+    def get_company_info(_self, symbol):
         """
         Get comprehensive company information and key metrics
 
@@ -217,51 +409,8 @@ class DataLoader:
             info = ticker.info
 
             # Extract key metrics safely
-            key_metrics = {
-                'symbol': symbol,
-                'name': info.get('longName', 'N/A'),
-                'sector': info.get('sector', 'N/A'),
-                'industry': info.get('industry', 'N/A'),
-                'country': info.get('country', 'N/A'),
-                'website': info.get('website', 'N/A'),
-
-                # Financial metrics
-                'market_cap': info.get('marketCap', 0),
-                'enterprise_value': info.get('enterpriseValue', 0),
-                'pe_ratio': info.get('trailingPE', 0),
-                'forward_pe': info.get('forwardPE', 0),
-                'peg_ratio': info.get('pegRatio', 0),
-                'price_to_book': info.get('priceToBook', 0),
-                'price_to_sales': info.get('priceToSalesTrailing12Months', 0),
-
-                # Dividends
-                'dividend_yield': info.get('dividendYield', 0),
-                'dividend_rate': info.get('dividendRate', 0),
-                'payout_ratio': info.get('payoutRatio', 0),
-
-                # Performance metrics
-                'beta': info.get('beta', 0),
-                'eps': info.get('trailingEps', 0),
-                'revenue': info.get('totalRevenue', 0),
-                'profit_margin': info.get('profitMargins', 0),
-                'operating_margin': info.get('operatingMargins', 0),
-                'return_on_equity': info.get('returnOnEquity', 0),
-                'return_on_assets': info.get('returnOnAssets', 0),
-
-                # Trading metrics
-                'volume': info.get('volume', 0),
-                'avg_volume': info.get('averageVolume', 0),
-                '52_week_high': info.get('fiftyTwoWeekHigh', 0),
-                '52_week_low': info.get('fiftyTwoWeekLow', 0),
-
-                # Analyst recommendations
-                'target_price': info.get('targetMeanPrice', 0),
-                'recommendation': info.get('recommendationKey', 'N/A'),
-                'num_analyst_opinions': info.get('numberOfAnalystOpinions', 0),
-
-                # Business description
-                'business_summary': info.get('longBusinessSummary', 'N/A')
-            }
+            key_metrics = {'symbol': symbol}
+            key_metrics.update((key, info.get(source, default)) for key, source, default in _self._INFO_FIELDS)
 
             return key_metrics
 
@@ -269,7 +418,32 @@ class DataLoader:
             st.error(f"Error fetching company info for {symbol}: {str(e)}")
             return None
 
-    def format_currency(self, value):
+    def get_company_info_many(self, symbols):
+        """
+        Get company information for several symbols at once
+
+        Lookups run concurrently and go through the cached get_company_info;
+        yfinance shares one HTTP session across tickers, so connections are
+        reused between requests.
+
+        Args:
+            symbols (list): List of stock symbols
+
+        Returns:
+            dict: Dictionary with symbol as key and company info dict as value
+        """
+
+        if not symbols:
+            return {}
+
+        with _script_thread_pool(min(16, len(symbols))) as executor:
+            results = list(executor.map(self.get_company_info, symbols))
+
+        return {symbol: info for symbol, info in zip(symbols, results) if info is not None}
+
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def format_currency(value):
         """
         Format currency values for display
 
@@ -293,7 +467,9 @@ class DataLoader:
         else:
             return f"${value:.2f}"
 
-    def format_percentage(self, value):
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def format_percentage(value):
         """
         Format percentage values for display
 
@@ -308,7 +484,9 @@ class DataLoader:
 
         return f"{value:.2%}"
 
-    def format_number(self, value):
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def format_number(value):
         """
         Format large numbers for display
 
@@ -330,6 +508,58 @@ class DataLoader:
         else:
             return f"{value:.2f}"
 
+    @staticmethod
+    def format_currency_array(values):
+        """
+        Format an array of currency values for display (vectorized format_currency)
+
+        Args:
+            values (array-like): Currency values
+
+        Returns:
+            np.ndarray: Formatted currency strings
+        """
+        return DataLoader._format_tiered_array(values, [1e3, 1e6, 1e9, 1e12], ['', 'K', 'M', 'B', 'T'], '$')
+
+    @staticmethod
+    def format_number_array(values):
+        """
+        Format an array of large numbers for display (vectorized format_number)
+
+        Args:
+            values (array-like): Numbers to format
+
+        Returns:
+            np.ndarray: Formatted number strings
+        """
+        return DataLoader._format_tiered_array(values, [1e3, 1e6, 1e9], ['', 'K', 'M', 'B'], '')
+
+    @staticmethod
+    def _format_tiered_array(values, thresholds, suffixes, prefix):
+        """
+        Format values with magnitude suffixes, picking each tier with np.searchsorted
+
+        Mirrors the scalar formatters: a value >= a threshold moves up a tier,
+        and NaN or zero becomes "N/A".
+
+        Args:
+            values (array-like): Values to format
+            thresholds (list): Ascending tier boundaries
+            suffixes (list): Suffix per tier, one more than thresholds
+            prefix (str): Prefix for every formatted value (e.g., '$')
+
+        Returns:
+            np.ndarray: Formatted strings
+        """
+        values = np.asarray(values, dtype=np.float64)
+        tier = np.searchsorted(thresholds, values, side='right')
+
+        divisors = np.concatenate([[1.0], thresholds])[tier]
+        formatted = np.char.add(prefix, np.char.mod('%.2f', values / divisors))
+        formatted = np.char.add(formatted, np.asarray(suffixes)[tier])
+
+        return np.where(np.isnan(values) | (values == 0), "N/A", formatted)
+
     def get_data_quality_report(self, data):
         """
         Generate a data quality report for debugging
@@ -345,7 +575,17 @@ class DataLoader:
             return {"status": "No data"}
 
         total_rows = len(data)
-        missing_values = data.isnull().sum()
+
+        # Count NaNs for all numeric columns in one pass over a single 2-D array
+        numeric = data.select_dtypes(include=[np.number])
+        numeric_missing = np.isnan(numeric.to_numpy(dtype=np.float64, na_value=np.nan)).sum(axis=0)
+        missing_counts = dict(zip(numeric.columns, numeric_missing))
+
+        # Only a handful of non-numeric columns (e.g. Symbol) remain
+        for column in data.columns.difference(numeric.columns):
+            missing_counts[column] = data[column].isna().sum()
+
+        missing_values = pd.Series(missing_counts).reindex(data.columns)
 
         quality_report = {
             "total_rows": total_rows,
@@ -354,13 +594,13 @@ class DataLoader:
             "missing_percentage": (missing_values / total_rows * 100).to_dict(),
             "data_types": data.dtypes.to_dict(),
             "memory_usage": data.memory_usage(deep=True).sum(),
-            "duplicate_rows": data.duplicated().sum()
+            "duplicate_timestamps": int(data.index.duplicated().sum())
         }
 
         return quality_report
 
     @st.cache_data(ttl=1800)  # Cache for 30 minutes
-    def get_stock_news(self, symbol, count=10):
+    def get_stock_news(_self, symbol, count=10):
         """
         Fetch recent news for a stock (placeholder for future implementation)
 
@@ -375,28 +615,16 @@ class DataLoader:
         # This is a placeholder - in a real implementation, you would
         # integrate with a news API like NewsAPI, Alpha Vantage, or others
 
-        sample_news = [
-            {
-                "title": f"{symbol} Reports Strong Quarterly Earnings",
-                "summary": f"Company {symbol} exceeded analyst expectations with revenue growth.",
-                "published_at": datetime.now() - timedelta(hours=2),
-                "source": "Financial Times",
-                "url": "https://example.com/news1"
-            },
-            {
-                "title": f"{symbol} Announces New Product Launch",
-                "summary": f"{symbol} unveiled its latest innovation at the tech conference.",
-                "published_at": datetime.now() - timedelta(hours=8),
-                "source": "Reuters",
-                "url": "https://example.com/news2"
-            },
+        # Build only the requested items, stamping them with a single clock read
+        now = datetime.now()
+
+        return [
             {
-                "title": f"Analyst Upgrades {symbol} Rating",
-                "summary": f"Wall Street analyst raises price target for {symbol}.",
-                "published_at": datetime.now() - timedelta(days=1),
-                "source": "Bloomberg",
-                "url": "https://example.com/news3"
+                "title": title.format(symbol=symbol),
+                "summary": summary.format(symbol=symbol),
+                "published_at": now - age,
+                "source": source,
+                "url": url
             }
+            for age, title, summary, source, url in _self._NEWS_TEMPLATE[:count]
         ]
-
-        return sample_news[:count]
\ No newline at end of file
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from app import _downsample_ohlcv
+
+
+def _ohlcv(rows):
+    base = np.arange(rows, dtype=np.float64)
+    return pd.DataFrame({
+        'Open': base + 0.5,
+        'High': base + 2.0,
+        'Low': base - 1.0,
+        'Close': base + 1.0,
+        'Volume': np.full(rows, 10)
+    }, index=pd.date_range('2020-01-01', periods=rows, freq='h'))
+
+
+def test_downsample_ohlcv_keeps_short_histories():
+    data = _ohlcv(50)
+
+    assert _downsample_ohlcv(data, max_points=50) is data
+
+
+def test_downsample_ohlcv_aggregates_buckets():
+    data = _ohlcv(10)
+    result = _downsample_ohlcv(data, max_points=4)
+
+    # ceil(10 / 4) = 3 bars per bucket, the last bucket holds the remainder
+    assert len(result) == 4
+    assert list(result.index) == list(data.index[::3])
+    assert list(result['Open']) == [0.5, 3.5, 6.5, 9.5]
+    assert list(result['High']) == [4.0, 7.0, 10.0, 11.0]
+    assert list(result['Low']) == [-1.0, 2.0, 5.0, 8.0]
+    assert list(result['Close']) == [3.0, 6.0, 9.0, 10.0]
+    assert list(result['Volume']) == [30, 30, 30, 10]
+
+
+def test_downsample_ohlcv_respects_max_points():
+    data = _ohlcv(5003)
+    result = _downsample_ohlcv(data, max_points=2000)
+
+    assert len(result) <= 2000
+    assert result['Volume'].sum() == data['Volume'].sum()
+    assert result['High'].max() == data['High'].max()
+    assert result['Low'].min() == data['Low'].min()
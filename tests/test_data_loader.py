@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from components.data_loader import DataLoader
+
+
+def _raw_ohlcv(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    spread = rng.uniform(0.1, 2.0, rows)
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 0.5, rows),
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(1_000, 5_000_000, rows)
+    }, index=pd.date_range('2024-01-01', periods=rows, freq='D'))
+
+
+def _pandas_baseline(data, symbol):
+    """The original pandas implementation of DataLoader._clean_stock_data"""
+    data = data.dropna(how='all').ffill()
+    data['Symbol'] = symbol
+    data['Returns'] = data['Close'].pct_change()
+    data['Log_Returns'] = np.log(data['Close'] / data['Close'].shift(1))
+    data['Volatility'] = data['Returns'].rolling(window=20).std()
+    data['Price_Range'] = data['High'] - data['Low']
+    data['Price_Range_Pct'] = (data['Price_Range'] / data['Close']) * 100
+    data['Volume_MA'] = data['Volume'].rolling(window=20).mean()
+    data['Volume_Ratio'] = data['Volume'] / data['Volume_MA']
+    data['Support'] = data['Low'].rolling(window=20).min()
+    data['Resistance'] = data['High'].rolling(window=20).max()
+    return data
+
+
+@pytest.mark.parametrize('rows', [1, 5, 19, 20, 21, 260])
+def test_compute_features_matches_pandas_baseline(rows):
+    raw = _raw_ohlcv(rows)
+    features = DataLoader._compute_features(
+        *(raw[column].to_numpy(dtype=np.float64) for column in ['Close', 'High', 'Low', 'Volume'])
+    )
+    expected = _pandas_baseline(raw.copy(), 'AAPL')
+
+    assert list(features) == list(expected.columns[6:])
+
+    for column, values in features.items():
+        np.testing.assert_allclose(values, expected[column].to_numpy(dtype=np.float64),
+                                   rtol=1e-12, equal_nan=True, err_msg=column)
+
+
+@pytest.mark.parametrize('rows', [1, 5, 19, 20, 21, 260])
+def test_clean_stock_data_matches_pandas_baseline(rows):
+    raw = _raw_ohlcv(rows)
+    result = DataLoader()._clean_stock_data(raw.copy(), 'AAPL')
+    expected = _pandas_baseline(raw.copy(), 'AAPL')
+
+    assert list(result.columns) == list(expected.columns)
+    assert (result['Symbol'] == 'AAPL').all()
+
+    for column in expected.columns.drop('Symbol'):
+        # Downcast columns only keep float32 precision
+        rtol = 1e-12 if result[column].dtype == np.float64 else 1e-6
+        np.testing.assert_allclose(
+            result[column].to_numpy(dtype=np.float64),
+            expected[column].to_numpy(dtype=np.float64),
+            rtol=rtol, equal_nan=True, err_msg=column
+        )
+
+
+def test_clean_stock_data_forward_fills_gaps():
+    raw = _raw_ohlcv(40)
+    raw.iloc[10] = np.nan
+    raw.iloc[25, raw.columns.get_loc('Close')] = np.nan
+
+    result = DataLoader()._clean_stock_data(raw.copy(), 'MSFT')
+    expected = _pandas_baseline(raw.copy(), 'MSFT')
+
+    assert len(result) == len(expected) == 39
+    np.testing.assert_allclose(result['Volatility'], expected['Volatility'], rtol=1e-6, equal_nan=True)
+    np.testing.assert_allclose(result['Support'], expected['Support'], rtol=1e-6, equal_nan=True)
+
+
+def test_clean_stock_data_downcasts_dtypes():
+    result = DataLoader()._clean_stock_data(_raw_ohlcv(60), 'AAPL')
+
+    for column in DataLoader._FLOAT64_COLUMNS:
+        assert result[column].dtype == np.float64, column
+
+    for column in ['Open', 'High', 'Low', 'Volatility', 'Price_Range', 'Price_Range_Pct',
+                   'Volume_MA', 'Volume_Ratio', 'Support', 'Resistance']:
+        assert result[column].dtype == np.float32, column
+
+    assert result['Volume'].dtype == np.int32
+    assert isinstance(result['Symbol'].dtype, pd.CategoricalDtype)
+
+
+@pytest.mark.parametrize('volume, dtype', [
+    (100, np.int32),
+    (20_000, np.int32),
+    (np.iinfo(np.int32).max + 1, np.int64)
+])
+def test_clean_stock_data_volume_dtype_floor(volume, dtype):
+    raw = _raw_ohlcv(30)
+    raw['Volume'] = np.arange(30) + volume - 29
+
+    result = DataLoader()._clean_stock_data(raw, 'THIN')
+
+    assert result['Volume'].dtype == dtype
+    assert (result['Volume'] * 2 > 0).all()
+
+
+@pytest.mark.parametrize('array_func, scalar_func', [
+    (DataLoader.format_currency_array, DataLoader.format_currency),
+    (DataLoader.format_number_array, DataLoader.format_number)
+])
+def test_format_arrays_match_scalar_formatters(array_func, scalar_func):
+    values = [0.0, np.nan, -5000.0, 0.5, 999.99, 1e3, 1e3 - 1e-9, 12345.678,
+              999_999.0, 1e6, 2.5e8, 1e9, 7.25e11, 1e12, 3.4e15]
+
+    assert list(array_func(values)) == [scalar_func(value) for value in values]